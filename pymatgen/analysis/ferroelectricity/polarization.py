@@ -48,6 +48,8 @@ determine the spontaneous polarization because it serves as a reference point.
 """
 
 
+import itertools
+
 from pymatgen.core.structure import Structure
 from pymatgen.core.lattice import Lattice
 import numpy as np
@@ -67,10 +69,7 @@ def zval_dict_from_potcar(potcar):
 
     potcar: Potcar object
     """
-    zval_dict = {}
-    for p in potcar:
-        zval_dict.update({p.element: p.ZVAL})
-    return zval_dict
+    return {p.element: p.ZVAL for p in potcar}
 
 
 def calc_ionic(site, structure, zval):
@@ -83,8 +82,19 @@ def calc_ionic(site, structure, zval):
 
     Returns polarization in electron Angstroms.
     """
-    norms = structure.lattice.lengths
-    return np.multiply(norms, -site.frac_coords * zval)
+    return _calc_ionic(site.frac_coords, zval, np.array(structure.lattice.lengths))
+
+
+def _calc_ionic(frac_coords, zval, norms):
+    """
+    Ionic dipole moment from precomputed lattice lengths. Broadcasts over
+    arrays of fractional coordinates (shape [N, 3]) and ZVALs (shape [N, 1]).
+
+    frac_coords: fractional coordinates of the ion(s)
+    zval: Charge value for ion(s)
+    norms: lattice lengths (a, b, c)
+    """
+    return -frac_coords * zval * norms
 
 
 def get_total_ionic_dipole(structure, zval_dict):
@@ -97,11 +107,58 @@ def get_total_ionic_dipole(structure, zval_dict):
     tiny (float) : tolerance for determining boundary of calculation.
     """
 
-    tot_ionic = []
-    for site in structure:
-        zval = zval_dict[str(site.specie)]
-        tot_ionic.append(calc_ionic(site, structure, zval))
-    return np.sum(tot_ionic, axis=0)
+    norms = np.array(structure.lattice.lengths)
+    species = structure.species
+    # Look up ZVALs once per distinct species rather than once per site
+    species_zvals = {sp: zval_dict[str(sp)] for sp in set(species)}
+    zvals = np.fromiter((species_zvals[sp] for sp in species),
+                        dtype=np.float64, count=len(species))
+    return np.sum(_calc_ionic(structure.frac_coords, zvals[:, np.newaxis], norms), axis=0)
+
+
+# Integer lattice translations to all 27 neighboring periodic images
+_NEIGHBOR_IMAGES = np.array(list(itertools.product([-1, 0, 1], repeat=3)))
+
+
+def _get_nearest_image(frac_coords, lattice, coords):
+    """
+    Find the periodic image of a point that is closest to given cartesian
+    coords without building a Structure. The offset to coords is wrapped in
+    the LLL reduced basis of the lattice, where checking the 27 neighboring
+    translations finds the closest image also for strongly skewed cells.
+
+    frac_coords: fractional coordinates of the point in lattice
+    lattice: Lattice
+    coords: cartesian coords to find the closest image to
+
+    Returns fractional and cartesian coordinates of the closest image.
+    """
+    lll_frac_coords = lattice.get_lll_frac_coords(frac_coords - lattice.get_fractional_coords(coords))
+    images = lll_frac_coords - np.round(lll_frac_coords) + _NEIGHBOR_IMAGES
+    i = np.argmin(np.linalg.norm(np.dot(images, lattice.lll_matrix), axis=1))
+    # The translation is integer in both bases, round off numerical noise
+    shift = np.round(lattice.get_frac_coords_from_lll(images[i] - lll_frac_coords))
+    image_frac_coords = frac_coords + shift
+    return image_frac_coords, lattice.get_cartesian_coords(image_frac_coords)
+
+
+def _same_branch_walk(frac_coords, lattices):
+    """
+    Walk along the distortion path, choosing for each polarization the
+    periodic image closest to the image chosen for the previous one.
+
+    frac_coords: np.array of fractional polarizations with shape [N, 3]
+    lattices: list of N polarization Lattices
+
+    Returns np.array of fractional coordinates of the chosen images.
+    """
+    images = np.empty((len(frac_coords), 3), dtype=np.float64)
+    # Adjust nonpolar polarization to be closest to zero.
+    # This is compatible with both a polarization of zero or a half quantum.
+    prev_coords = np.zeros(3)
+    for i, lattice in enumerate(lattices):
+        images[i], prev_coords = _get_nearest_image(frac_coords[i], lattice, prev_coords)
+    return images
 
 
 class PolarizationLattice(Structure):
@@ -147,6 +204,13 @@ class Polarization:
     are given in electron Angstroms along the three lattice directions
     (a,b,c).
 
+    Same branch data, splines and lattice parameters are cached. Reassigning
+    p_elecs, p_ions or structures clears the caches, but modifying these
+    arrays or structures in place does not, so don't do that after
+    construction. The p_elecs and p_ions given are copied, but note that
+    get_pelecs_and_pions(convert_to_muC_per_cm2=False) returns the arrays
+    held by the instance.
+
     """
 
     def __init__(self, p_elecs, p_ions, structures, p_elecs_in_cartesian=True, p_ions_in_cartesian=False):
@@ -168,10 +232,62 @@ class Polarization:
         if p_ions_in_cartesian:
             p_ions = np.array(
                 [struct.lattice.get_vector_along_lattice_directions(p_ions[i]) for i, struct in enumerate(structures)])
-        self.p_elecs = np.array(p_elecs)
-        self.p_ions = np.array(p_ions)
+        # Same branch data and splines only depend on the inputs below, so they
+        # are computed once per (convert_to_muC_per_cm2, all_in_polar) pair.
+        self._same_branch_cache = {}
+        self._splines_cache = {}
+        # Lattice lengths and volumes of structures, see _get_lattice_abcs_and_volumes
+        self._lattice_abcs_and_volumes = None
+        self.p_elecs = p_elecs
+        self.p_ions = p_ions
         self.structures = structures
 
+    def _clear_caches(self):
+        """
+        Drop all results derived from p_elecs, p_ions and structures.
+        """
+        self._same_branch_cache.clear()
+        self._splines_cache.clear()
+        self._lattice_abcs_and_volumes = None
+
+    @property
+    def p_elecs(self):
+        """
+        np.array of electronic contribution to the polarization with shape [N, 3]
+        along the lattice directions
+        """
+        return self._p_elecs
+
+    @p_elecs.setter
+    def p_elecs(self, p_elecs):
+        self._p_elecs = np.array(p_elecs, dtype=np.float64)
+        self._clear_caches()
+
+    @property
+    def p_ions(self):
+        """
+        np.array of ionic contribution to the polarization with shape [N, 3]
+        along the lattice directions
+        """
+        return self._p_ions
+
+    @p_ions.setter
+    def p_ions(self, p_ions):
+        self._p_ions = np.array(p_ions, dtype=np.float64)
+        self._clear_caches()
+
+    @property
+    def structures(self):
+        """
+        Structures along the distortion path, in order of nonpolar to polar
+        """
+        return self._structures
+
+    @structures.setter
+    def structures(self, structures):
+        self._structures = structures
+        self._clear_caches()
+
     @classmethod
     def from_outcars_and_structures(cls, outcars, structures,
                                     calc_ionic_from_zval=False):
@@ -195,6 +311,20 @@ class Polarization:
                 p_ions.append(o.p_ion)
         return cls(p_elecs, p_ions, structures)
 
+    def _get_lattice_abcs_and_volumes(self):
+        """
+        Lattice lengths (shape [N, 3]) and volumes (shape [N]) of the
+        structures. These are read from the lattices only once.
+        """
+        if self._lattice_abcs_and_volumes is None:
+            lattices = [s.lattice for s in self.structures]
+            abcs = np.array([lattice.abc for lattice in lattices])
+            volumes = np.array([lattice.volume for lattice in lattices])
+            abcs.setflags(write=False)
+            volumes.setflags(write=False)
+            self._lattice_abcs_and_volumes = abcs, volumes
+        return self._lattice_abcs_and_volumes
+
     def get_pelecs_and_pions(self, convert_to_muC_per_cm2=False):
         """
         Get the electronic and ionic dipole moments / polarizations.
@@ -206,22 +336,13 @@ class Polarization:
         if not convert_to_muC_per_cm2:
             return self.p_elecs, self.p_ions
 
-        if convert_to_muC_per_cm2:
-            p_elecs = self.p_elecs.T
-            p_ions = self.p_ions.T
-
-            volumes = [s.lattice.volume for s in self.structures]
-            e_to_muC = -1.6021766e-13
-            cm2_to_A2 = 1e16
-            units = 1.0 / np.array(volumes)
-            units *= e_to_muC * cm2_to_A2
-
-            p_elecs = np.matmul(units, p_elecs)
-            p_ions = np.matmul(units, p_ions)
-
-            p_elecs, p_ions = p_elecs.T, p_ions.T
+        _, volumes = self._get_lattice_abcs_and_volumes()
+        e_to_muC = -1.6021766e-13
+        cm2_to_A2 = 1e16
+        # Scale each structure's dipole moment by its own volume, shape [N, 1]
+        units = (e_to_muC * cm2_to_A2 / volumes)[:, np.newaxis]
 
-            return p_elecs, p_ions
+        return self.p_elecs * units, self.p_ions * units
 
     def get_same_branch_polarization_data(self, convert_to_muC_per_cm2=True, all_in_polar=True):
         r"""
@@ -245,8 +366,7 @@ class Polarization:
 
         Given N polarization calculations in order from nonpolar to polar, this algorithm
         minimizes the distance between adjacent polarization images. To do this, it
-        constructs a polarization lattice for each polarization calculation using the
-        pymatgen.core.structure class and calls the get_nearest_site method to find the
+        constructs a polarization lattice for each polarization calculation and finds the
         image of a given polarization lattice vector that is closest to the previous polarization
         lattice vector image.
 
@@ -261,104 +381,63 @@ class Polarization:
             microCoulomb per centimeter**2
         all_in_polar: convert polarization to be in polar (final structure) polarization lattice
         """
+        key = (convert_to_muC_per_cm2, all_in_polar)
+        if key in self._same_branch_cache:
+            return self._same_branch_cache[key].copy()
 
         p_elec, p_ion = self.get_pelecs_and_pions()
         p_tot = p_elec + p_ion
-        p_tot = np.array(p_tot)
 
         lattices = [s.lattice for s in self.structures]
-        volumes = np.array([s.lattice.volume for s in self.structures])
+        abcs, volumes = self._get_lattice_abcs_and_volumes()  # [N, 3], [N]
 
         L = len(p_elec)
 
         e_to_muC = -1.6021766e-13
         cm2_to_A2 = 1e16
-        units = 1.0 / np.array(volumes)
+        units = 1.0 / volumes
         units *= e_to_muC * cm2_to_A2
 
         # convert polarizations and lattice lengths prior to adjustment
         if convert_to_muC_per_cm2 and not all_in_polar:
             # Convert the total polarization
-            p_tot = np.multiply(units.T[:, np.newaxis], p_tot)
+            p_tot = p_tot * units[:, np.newaxis]
             # adjust lattices
-            for i in range(L):
-                lattice = lattices[i]
-                l = lattice.lengths
-                a = lattice.angles
-                lattices[i] = Lattice.from_parameters(*(np.array(l) * units.ravel()[i]), *a)
+            abcs = abcs * units[:, np.newaxis]
+            lattices = [Lattice.from_parameters(*abc, *lattice.angles)
+                        for abc, lattice in zip(abcs, lattices)]
         #  convert polarizations to polar lattice
         elif convert_to_muC_per_cm2 and all_in_polar:
-            abc = [lattice.abc for lattice in lattices]
-            abc = np.array(abc)  # [N, 3]
-            p_tot /= abc  # e * Angstroms to e
-            p_tot *= abc[-1] / volumes[-1] * e_to_muC * cm2_to_A2  # to muC / cm^2
-            for i in range(L):
-                lattice = lattices[-1]  # Use polar lattice
-                l = lattice.lengths
-                a = lattice.angles
-                # Use polar units (volume)
-                lattices[i] = Lattice.from_parameters(*(np.array(l) * units.ravel()[-1]), *a)
-
-        d_structs = []
-        sites = []
-        for i in range(L):
-            l = lattices[i]
-            frac_coord = np.divide(np.array([p_tot[i]]),
-                                   np.array([l.a, l.b, l.c]))
-            d = PolarizationLattice(l, ["C"], [np.array(frac_coord).ravel()])
-            d_structs.append(d)
-            site = d[0]
-            if i == 0:
-                # Adjust nonpolar polarization to be closest to zero.
-                # This is compatible with both a polarization of zero or a half quantum.
-                prev_site = [0, 0, 0]
-            else:
-                prev_site = sites[-1].coords
-            new_site = d.get_nearest_site(prev_site, site)
-            sites.append(new_site[0])
+            p_tot /= abcs  # e * Angstroms to e
+            p_tot *= abcs[-1] * units[-1]  # to muC / cm^2
+            # Use polar lattice and polar units (volume)
+            abcs = np.tile(abcs[-1] * units[-1], (L, 1))
+            lattices = [Lattice.from_parameters(*abcs[-1], *lattices[-1].angles)] * L
 
-        adjust_pol = []
-        for s, d in zip(sites, d_structs):
-            l = d.lattice
-            adjust_pol.append(
-                np.multiply(s.frac_coords, np.array([l.a, l.b, l.c])).ravel())
-        adjust_pol = np.array(adjust_pol)
+        adjust_pol = _same_branch_walk(p_tot / abcs, lattices) * abcs
+        self._same_branch_cache[key] = adjust_pol
 
-        return adjust_pol
+        return adjust_pol.copy()
 
     def get_lattice_quanta(self, convert_to_muC_per_cm2=True, all_in_polar=True):
         """
         Returns the dipole / polarization quanta along a, b, and c for
         all structures.
         """
-        lattices = [s.lattice for s in self.structures]
-        volumes = np.array([s.lattice.volume for s in self.structures])
+        abcs, volumes = self._get_lattice_abcs_and_volumes()
 
-        L = len(self.structures)
+        if not convert_to_muC_per_cm2:
+            return np.array(abcs)
 
         e_to_muC = -1.6021766e-13
         cm2_to_A2 = 1e16
-        units = 1.0 / np.array(volumes)
-        units *= e_to_muC * cm2_to_A2
+        # Quanta are lattice lengths, so they are positive whatever the sign of the units
+        units = np.abs(e_to_muC * cm2_to_A2 / volumes)
 
-        # convert polarizations and lattice lengths prior to adjustment
-        if convert_to_muC_per_cm2 and not all_in_polar:
-            # adjust lattices
-            for i in range(L):
-                lattice = lattices[i]
-                l = lattice.lengths
-                a = lattice.angles
-                lattices[i] = Lattice.from_parameters(*(np.array(l) * units.ravel()[i]), *a)
-        elif convert_to_muC_per_cm2 and all_in_polar:
-            for i in range(L):
-                lattice = lattices[-1]
-                l = lattice.lengths
-                a = lattice.angles
-                lattices[i] = Lattice.from_parameters(*(np.array(l) * units.ravel()[-1]), *a)
-
-        quanta = np.array([np.array(l.lengths) for l in lattices])
-
-        return quanta
+        if all_in_polar:
+            # Use polar lattice and polar units (volume) for all structures
+            return np.tile(abcs[-1] * units[-1], (len(abcs), 1))
+        return abcs * units[:, np.newaxis]
 
     def get_polarization_change(self, convert_to_muC_per_cm2=True, all_in_polar=True):
         """
@@ -376,68 +455,84 @@ class Polarization:
         polarization.
         """
         polar = self.structures[-1]
-        a, b, c = polar.lattice.matrix
-        a, b, c = a / np.linalg.norm(a), b / np.linalg.norm(
-            b), c / np.linalg.norm(c)
+        matrix = polar.lattice.matrix
+        # Unit vectors along a, b and c
+        unit_vectors = matrix / np.linalg.norm(matrix, axis=1)[:, np.newaxis]
         P = self.get_polarization_change(convert_to_muC_per_cm2=convert_to_muC_per_cm2,
                                          all_in_polar=all_in_polar).ravel()
-        P_norm = np.linalg.norm(a * P[0] + b * P[1] + c * P[2])
+        P_norm = np.linalg.norm(np.dot(P, unit_vectors))
         return P_norm
 
-    def same_branch_splines(self, convert_to_muC_per_cm2=True, all_in_polar=True):
+    def same_branch_splines(self, convert_to_muC_per_cm2=True, all_in_polar=True, tot=None):
         """
         Fit splines to same branch polarization. This is used to assess any jumps
         in the same branch polarizaiton.
+
+        tot: precomputed same branch polarization data to fit. If None (default),
+            the data is obtained from get_same_branch_polarization_data and the
+            splines are cached.
         """
-        from scipy.interpolate import UnivariateSpline
-        tot = self.get_same_branch_polarization_data(
-            convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
-        L = tot.shape[0]
-        try:
-            sp_a = UnivariateSpline(range(L), tot[:, 0].ravel())
-        except Exception:
-            sp_a = None
-        try:
-            sp_b = UnivariateSpline(range(L), tot[:, 1].ravel())
-        except Exception:
-            sp_b = None
-        try:
-            sp_c = UnivariateSpline(range(L), tot[:, 2].ravel())
-        except Exception:
-            sp_c = None
-        return sp_a, sp_b, sp_c
+        key = (convert_to_muC_per_cm2, all_in_polar)
+        use_cache = tot is None
+        if use_cache:
+            if key in self._splines_cache:
+                return self._splines_cache[key]
+            tot = self.get_same_branch_polarization_data(
+                convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
 
-    def max_spline_jumps(self, convert_to_muC_per_cm2=True, all_in_polar=True):
+        from scipy.interpolate import UnivariateSpline
+        xs = np.arange(tot.shape[0])
+        sps = [None, None, None]
+        for i in range(3):
+            try:
+                sps[i] = UnivariateSpline(xs, tot[:, i])
+            except Exception:
+                pass
+        sps = tuple(sps)
+        if use_cache:
+            self._splines_cache[key] = sps
+        return sps
+
+    def max_spline_jumps(self, convert_to_muC_per_cm2=True, all_in_polar=True, tot=None, sps=None):
         """
         Get maximum difference between spline and same branch polarization data.
+
+        tot: precomputed same branch polarization data. Computed if None.
+        sps: precomputed splines from same_branch_splines. Fit to tot if None.
         """
-        tot = self.get_same_branch_polarization_data(
-            convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
-        sps = self.same_branch_splines(convert_to_muC_per_cm2=convert_to_muC_per_cm2,
-                                       all_in_polar=all_in_polar)
+        if sps is None:
+            sps = self.same_branch_splines(convert_to_muC_per_cm2=convert_to_muC_per_cm2,
+                                           all_in_polar=all_in_polar, tot=tot)
+        if tot is None:
+            tot = self.get_same_branch_polarization_data(
+                convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
+        xs = np.arange(tot.shape[0])
         max_jumps = [None, None, None]
         for i, sp in enumerate(sps):
             if sp is not None:
-                max_jumps[i] = max(tot[:, i].ravel() - sp(range(len(tot[:, i].ravel()))))
+                max_jumps[i] = np.max(tot[:, i] - sp(xs))
         return max_jumps
 
-    def smoothness(self, convert_to_muC_per_cm2=True, all_in_polar=True):
+    def smoothness(self, convert_to_muC_per_cm2=True, all_in_polar=True, tot=None, sps=None):
         """
         Get rms average difference between spline and same branch polarization data.
+        The rms is NaN along directions where the spline fit failed.
+
+        tot: precomputed same branch polarization data. Computed if None.
+        sps: precomputed splines from same_branch_splines. Fit to tot if None.
         """
-        tot = self.get_same_branch_polarization_data(
-            convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
+        if sps is None:
+            sps = self.same_branch_splines(convert_to_muC_per_cm2=convert_to_muC_per_cm2,
+                                           all_in_polar=all_in_polar, tot=tot)
+        if tot is None:
+            tot = self.get_same_branch_polarization_data(
+                convert_to_muC_per_cm2=convert_to_muC_per_cm2, all_in_polar=all_in_polar)
         L = tot.shape[0]
-        try:
-            sp = self.same_branch_splines(convert_to_muC_per_cm2=convert_to_muC_per_cm2,
-                                          all_in_polar=all_in_polar)
-        except Exception:
-            print("Something went wrong.")
-            return None
-        sp_latt = [sp[i](range(L)) for i in range(3)]
-        diff = [sp_latt[i] - tot[:, i].ravel() for i in range(3)]
-        rms = [np.sqrt(np.sum(np.square(diff[i])) / L) for i in range(3)]
-        return rms
+        xs = np.arange(L)
+        sp_latt = np.column_stack([sp(xs) if sp is not None else np.full(L, np.nan) for sp in sps])
+        diff = sp_latt - tot
+        rms = np.linalg.norm(diff, axis=0) / np.sqrt(L)
+        return list(rms)
 
 
 class EnergyTrend:
@@ -470,7 +565,7 @@ class EnergyTrend:
             return None
         spline_energies = sp(range(len(energies)))
         diff = spline_energies - energies
-        rms = np.sqrt(np.sum(np.square(diff)) / len(energies))
+        rms = np.linalg.norm(diff) / np.sqrt(len(energies))
         return rms
 
     def max_spline_jump(self):
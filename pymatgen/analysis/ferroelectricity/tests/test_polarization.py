@@ -2,6 +2,8 @@ import unittest
 
 import os
 from pymatgen.analysis.ferroelectricity.polarization import *
+from pymatgen.analysis.ferroelectricity.polarization import _get_nearest_image
+from pymatgen.core.lattice import Lattice
 from pymatgen.core.structure import Structure
 from pymatgen.io.vasp.outputs import Outcar
 from pymatgen.io.vasp.inputs import Potcar
@@ -43,6 +45,27 @@ class UtilsTest(PymatgenTest):
         p_ion = get_total_ionic_dipole(self.structures[-1], self.zval_dict)
         self.assertArrayAlmostEqual(p_ion, self.ions[-1].ravel().tolist())
 
+    def test_get_nearest_image(self):
+        lattice = Lattice.from_parameters(3.9, 4.1, 4.3, 80, 95, 105)
+        for frac_coords, coords in [([0.2, -1.7, 2.4], [0, 0, 0]),
+                                    ([0.9, 0.1, -0.6], [3.5, -2.0, 7.1])]:
+            d = PolarizationLattice(lattice, ["C"], [frac_coords])
+            site, _ = d.get_nearest_site(coords, d[0])
+            image_frac_coords, image_coords = _get_nearest_image(np.array(frac_coords), lattice, coords)
+            self.assertArrayAlmostEqual(image_coords, site.coords)
+            self.assertArrayAlmostEqual(image_frac_coords, site.frac_coords)
+
+        # Strongly skewed cell where the 27 neighbors of the rounded image do
+        # not contain the closest one
+        lattice = Lattice.from_parameters(3.9, 6.3, 2.2, 68, 66, 128)
+        frac_coords, coords = [-1.09, 1.43, -0.78], [-8.1, -4.51, -13.28]
+        d = PolarizationLattice(lattice, ["C"], [frac_coords])
+        site, dist = d.get_nearest_site(coords, d[0])
+        image_frac_coords, image_coords = _get_nearest_image(np.array(frac_coords), lattice, coords)
+        self.assertAlmostEqual(np.linalg.norm(image_coords - coords), dist)
+        self.assertArrayAlmostEqual(image_coords, site.coords)
+        self.assertArrayAlmostEqual(image_frac_coords, site.frac_coords)
+
 
 class PolarizationTest(PymatgenTest):
     def setUp(self):
@@ -126,6 +149,16 @@ class PolarizationTest(PymatgenTest):
         self.assertArrayAlmostEqual(p_ions[0].ravel().tolist(), self.p_ions[0].ravel().tolist())
         self.assertArrayAlmostEqual(p_ions[-1].ravel().tolist(), self.p_ions[-1].ravel().tolist())
 
+    def test_get_pelecs_and_pions(self):
+        p_elecs, p_ions = self.polarization.get_pelecs_and_pions(convert_to_muC_per_cm2=False)
+        self.assertEqual(p_elecs.shape, (len(self.structures), 3))
+        self.assertArrayAlmostEqual(p_ions, self.p_ions)
+        p_elecs_muC, p_ions_muC = self.polarization.get_pelecs_and_pions(convert_to_muC_per_cm2=True)
+        self.assertEqual(p_elecs_muC.shape, (len(self.structures), 3))
+        units = np.array([-1.6021766e-13 * 1e16 / s.lattice.volume for s in self.structures])
+        self.assertArrayAlmostEqual(p_elecs_muC, p_elecs * units[:, np.newaxis])
+        self.assertArrayAlmostEqual(p_ions_muC, p_ions * units[:, np.newaxis])
+
     def test_get_same_branch_polarization_data(self):
         same_branch = self.polarization.get_same_branch_polarization_data(convert_to_muC_per_cm2=True,
                                                                           all_in_polar=False)
@@ -142,6 +175,26 @@ class PolarizationTest(PymatgenTest):
         self.assertArrayAlmostEqual(same_branch[-1].ravel().tolist(),
                                     self.same_branch_all_in_polar[-1].ravel().tolist())
 
+    def test_same_branch_cache(self):
+        same_branch = self.polarization.get_same_branch_polarization_data(convert_to_muC_per_cm2=True,
+                                                                          all_in_polar=True)
+        # Modifying the returned data must not affect later calls
+        same_branch += 1.0
+        same_branch = self.polarization.get_same_branch_polarization_data(convert_to_muC_per_cm2=True,
+                                                                          all_in_polar=True)
+        self.assertArrayAlmostEqual(same_branch[0].ravel().tolist(), self.same_branch_all_in_polar[0].ravel().tolist())
+        sps = self.polarization.same_branch_splines(convert_to_muC_per_cm2=True, all_in_polar=True)
+        self.assertIs(sps, self.polarization.same_branch_splines(convert_to_muC_per_cm2=True, all_in_polar=True))
+        self.assertIsNot(sps, self.polarization.same_branch_splines(convert_to_muC_per_cm2=True, all_in_polar=False))
+        # The inputs are copied, so the caller's arrays can't change cached data
+        self.assertIsNot(self.polarization.p_ions, self.p_ions)
+        # Reassigning an input clears the cache
+        self.polarization.p_elecs = self.polarization.p_elecs
+        self.assertIsNot(sps, self.polarization.same_branch_splines(convert_to_muC_per_cm2=True, all_in_polar=True))
+        same_branch = self.polarization.get_same_branch_polarization_data(convert_to_muC_per_cm2=True,
+                                                                          all_in_polar=True)
+        self.assertArrayAlmostEqual(same_branch[0].ravel().tolist(), self.same_branch_all_in_polar[0].ravel().tolist())
+
     def test_get_lattice_quanta(self):
         quanta = self.polarization.get_lattice_quanta(convert_to_muC_per_cm2=True, all_in_polar=False)
         self.assertArrayAlmostEqual(quanta[0].ravel().tolist(), self.quanta[0].ravel().tolist())
@@ -151,6 +204,17 @@ class PolarizationTest(PymatgenTest):
         self.assertArrayAlmostEqual(quanta[0].ravel().tolist(), self.quanta[-1].ravel().tolist())
         self.assertArrayAlmostEqual(quanta[-1].ravel().tolist(), self.quanta[-1].ravel().tolist())
 
+        # Reassigning the structures clears the cached lattices. Doubling the
+        # lattice lengths divides the quanta in muC/cm^2 by 4.
+        structures = [s.copy() for s in self.polarization.structures]
+        for s in structures:
+            s.scale_lattice(s.volume * 8)
+        self.polarization.structures = structures
+        quanta = self.polarization.get_lattice_quanta(convert_to_muC_per_cm2=True, all_in_polar=False)
+        self.assertArrayAlmostEqual(quanta, np.array(self.quanta) / 4)
+        quanta = self.polarization.get_lattice_quanta(convert_to_muC_per_cm2=True, all_in_polar=True)
+        self.assertArrayAlmostEqual(quanta, np.tile(np.array(self.quanta[-1]) / 4, (len(structures), 1)))
+
     def test_get_polarization_change(self):
         change = self.polarization.get_polarization_change(convert_to_muC_per_cm2=True, all_in_polar=False)
         self.assertArrayAlmostEqual(change, self.change)
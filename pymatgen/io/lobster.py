@@ -13,7 +13,6 @@ import itertools
 import os
 import re
 import warnings
-from collections import defaultdict
 from typing import Dict, Any, Optional, List
 
 import numpy as np
@@ -38,6 +37,39 @@ __date__ = "Dec 13, 2017"
 
 MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Bond line in COHPCAR headers, e.g. No.1:Fe1[3p_x]->Fe2[3d_x^2-y^2](2.45). Captures the
+# two site numbers, the two optional orbitals and the bond length.
+_bond_patt = re.compile(r"No\.\d+:\D+?(\d+)(?:\[([^\]]*)\])?->\D+?(\d+)(?:\[([^\]]*)\])?\(([^()]*)\)")
+
+# Lobster orbital labels, in the order of the Orbital enum
+_orbitals_by_label = {label: Orbital(i) for i, label in enumerate(
+    ["s", "p_y", "p_z", "p_x", "d_xy", "d_yz", "d_z^2", "d_xz", "d_x^2-y^2", "f_y(3x^2-y^2)", "f_xyz",
+     "f_yz^2", "f_z^3", "f_xz^2", "f_z(x^2-y^2)", "f_x(x^2-3y^2)"])}
+
+# Atom row in CHARGE.lobster: number, type, Mulliken and Loewdin charge
+_charge_patt = re.compile(r"^[ \t]*(\d+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)", re.MULTILINE)
+
+
+def _parse_float_rows(text: str, num_rows: int) -> np.ndarray:
+    """
+    Parse num_rows lines of whitespace separated floats into an array with one
+    row per line. The width is taken from the first line. np.fromstring stops
+    silently at the first token it cannot convert, so the number of values is
+    checked to reject truncated or corrupt data.
+
+    Args:
+        text: the rows as a single string.
+        num_rows: expected number of rows.
+
+    Returns:
+        np.array of shape [num_rows, num_columns]
+    """
+    num_columns = len(text.split("\n", 1)[0].split())
+    data = np.fromstring(text, sep=" ")
+    if num_columns == 0 or data.size != num_rows * num_columns:
+        raise ValueError("Expected %d rows of %d values, the data could not be parsed." % (num_rows, num_columns))
+    return data.reshape(num_rows, num_columns)
+
 
 class Cohpcar:
     """
@@ -76,6 +108,15 @@ class Cohpcar:
 
     """
 
+    __slots__ = [
+        "are_coops",
+        "efermi",
+        "is_spin_polarized",
+        "energies",
+        "orb_res_cohp",
+        "cohp_data",
+    ]
+
     def __init__(self, are_coops: bool = False, filename: str = None):
         """
         Args:
@@ -90,13 +131,20 @@ class Cohpcar:
                 else "COHPCAR.lobster"
 
         with zopen(filename, "rt") as f:
-            contents = f.read().split("\n")
+            f.readline()
+            # The parameters line is the second line in a COHPCAR file. It
+            # contains all parameters that are needed to map the file.
+            parameters = f.readline().split()
+            # Subtract 1 to skip the average
+            num_bonds = int(parameters[0]) - 1
+            # Skip the line for the average and read the bond lines
+            f.readline()
+            bond_lines = [f.readline().rstrip() for _ in range(num_bonds)]
+            # The COHP data start in row num_bonds + 3. Each row holds one energy,
+            # so every COHP/ICOHP is a column of the data. Parse the rest of the
+            # file in a single pass, the parameters give the number of energies.
+            data = _parse_float_rows(f.read(), int(parameters[2]))
 
-        # The parameters line is the second line in a COHPCAR file. It
-        # contains all parameters that are needed to map the file.
-        parameters = contents[1].split()
-        # Subtract 1 to skip the average
-        num_bonds = int(parameters[0]) - 1
         self.efermi = float(parameters[-1])
         if int(parameters[1]) == 2:
             spins = [Spin.up, Spin.down]
@@ -105,14 +153,17 @@ class Cohpcar:
             spins = [Spin.up]
             self.is_spin_polarized = False
 
-        # The COHP data start in row num_bonds + 3
-        data = np.array([np.array(row.split(), dtype=float) for row in contents[num_bonds + 3:]]).transpose()
-        data = np.array([np.array(row.split(), dtype=float) for row in contents[num_bonds + 3:]]).transpose()
-        self.energies = data[0]
-        cohp_data = {"average": {"COHP": {spin: data[1 + 2 * s * (num_bonds + 1)]
-                                          for s, spin in enumerate(spins)},
-                                 "ICOHP": {spin: data[2 + 2 * s * (num_bonds + 1)]
-                                           for s, spin in enumerate(spins)}}}  # type: Dict[Any, Any]
+        self.energies = data[:, 0]
+        # Each spin channel is a block of 2 * (num_bonds + 1) columns: the average
+        # COHP and ICOHP followed by the COHP and ICOHP of every bond. Slice the
+        # blocks into views with one column per bond.
+        stride = 2 * (num_bonds + 1)
+        blocks = [data[:, 1 + s * stride:1 + (s + 1) * stride] for s in range(len(spins))]
+        cohps = {spin: block[:, 2::2] for spin, block in zip(spins, blocks)}
+        icohps = {spin: block[:, 3::2] for spin, block in zip(spins, blocks)}
+        cohp_data = {"average": {"COHP": {spin: block[:, 0] for spin, block in zip(spins, blocks)},
+                                 "ICOHP": {spin: block[:, 1] for spin, block in zip(spins, blocks)}}
+                     }  # type: Dict[Any, Any]
 
         orb_cohp = {}  # type: Dict[str, Any]
         # present for Lobster versions older than Lobster 2.2.0
@@ -121,16 +172,13 @@ class Cohpcar:
         # this is done to make the labeling consistent with ICOHPLIST.lobster
         bondnumber = 0
         for bond in range(num_bonds):
-            bond_data = self._get_bond_data(contents[3 + bond])
+            bond_data = self._get_bond_data(bond_lines[bond])
 
             label = str(bondnumber)
 
             orbs = bond_data["orbitals"]
-            cohp = {spin: data[2 * (bond + s * (num_bonds + 1)) + 3]
-                    for s, spin in enumerate(spins)}
-
-            icohp = {spin: data[2 * (bond + s * (num_bonds + 1)) + 4]
-                     for s, spin in enumerate(spins)}
+            cohp = {spin: cohps[spin][:, bond] for spin in spins}
+            icohp = {spin: icohps[spin][:, bond] for spin in spins}
             if orbs is None:
                 bondnumber = bondnumber + 1
                 label = str(bondnumber)
@@ -186,23 +234,16 @@ class Cohpcar:
             and a label for the orbitals (if orbital-resolved).
         """
 
-        orb_labs = ["s", "p_y", "p_z", "p_x", "d_xy", "d_yz", "d_z^2",
-                    "d_xz", "d_x^2-y^2", "f_y(3x^2-y^2)", "f_xyz",
-                    "f_yz^2", "f_z^3", "f_xz^2", "f_z(x^2-y^2)", "f_x(x^2-3y^2)"]
-
-        line_new = line.rsplit("(", 1)
-        # bondnumber = line[0].replace("->", ":").replace(".", ":").split(':')[1]
-        length = float(line_new[-1][:-1])
-
-        sites = line_new[0].replace("->", ":").split(":")[1:3]
-        site_indices = tuple(int(re.split(r"\D+", site)[1]) - 1
-                             for site in sites)
+        match = _bond_patt.fullmatch(line.strip())
+        if match is None:
+            raise ValueError("Could not parse COHPCAR bond line: %s" % line)
+        site1, orb1, site2, orb2, length = match.groups()
+        length = float(length)
+        site_indices = (int(site1) - 1, int(site2) - 1)
 
-        # species = tuple(re.split(r"\d+", site)[0] for site in sites)
-        if "[" in sites[0]:
-            orbs = [re.findall(r"\[(.*)\]", site)[0] for site in sites]
-            orbitals = [tuple((int(orb[0]), Orbital(orb_labs.index(orb[1:])))) for orb in
-                        orbs]  # type: Any
+        if orb1 is not None:
+            orbitals = [tuple((int(orb[0]), _orbitals_by_label[orb[1:]])) for orb in
+                        (orb1, orb2)]  # type: Any
             orb_label = "%d%s-%d%s" % (orbitals[0][0], orbitals[0][1].name,
                                        orbitals[1][0], orbitals[1][1].name)  # type: Any
 
@@ -239,6 +280,12 @@ class Icohplist:
 
     """
 
+    __slots__ = [
+        "are_coops",
+        "is_spin_polarized",
+        "_icohpcollection",
+    ]
+
     def __init__(self, are_coops: bool = False, filename: str = None):
         """
         Args:
@@ -254,7 +301,7 @@ class Icohplist:
 
         # LOBSTER list files have an extra trailing blank line
         # and we don't need the header.
-        with zopen(filename) as f:
+        with zopen(filename, "rt") as f:
             data = f.read().split("\n")[1:-1]
         if len(data) == 0:
             raise IOError("ICOHPLIST file contains no data.")
@@ -279,46 +326,29 @@ class Icohplist:
             num_bonds = len(data)
             self.is_spin_polarized = False
 
-        list_labels = []
-        list_atom1 = []
-        list_atom2 = []
-        list_length = []
-        list_translation = []
-        list_num = []
-        list_icohp = []
-        for bond in range(num_bonds):
-            line = data[bond].split()
-            icohp = {}
-            if version == '2.2.1':
-                label = "%s" % (line[0])
-                atom1 = str(line[1])
-                atom2 = str(line[2])
-                length = float(line[3])
-                icohp[Spin.up] = float(line[4])
-                num = int(line[5])
-                translation = [0, 0, 0]
-                if self.is_spin_polarized:
-                    icohp[Spin.down] = float(data[bond + num_bonds + 1].split()[4])
-
-            elif version == '3.1.1':
-                label = "%s" % (line[0])
-                atom1 = str(line[1])
-                atom2 = str(line[2])
-                length = float(line[3])
-                translation = [int(line[4]), int(line[5]), int(line[6])]
-                icohp[Spin.up] = float(line[7])
-                num = int(1)
-
-                if self.is_spin_polarized:
-                    icohp[Spin.down] = float(data[bond + num_bonds + 1].split()[7])
-
-            list_labels.append(label)
-            list_atom1.append(atom1)
-            list_atom2.append(atom2)
-            list_length.append(length)
-            list_translation.append(translation)
-            list_num.append(num)
-            list_icohp.append(icohp)
+        # Split all bond lines once and convert whole columns at a time. For spin
+        # polarized files the spin down rows follow the spin up rows in the table.
+        rows = data[:num_bonds]
+        if self.is_spin_polarized:
+            rows = rows + data[num_bonds + 1:2 * num_bonds + 1]
+        table = np.array([line.split() for line in rows])
+        list_labels = table[:num_bonds, 0].tolist()
+        list_atom1 = table[:num_bonds, 1].tolist()
+        list_atom2 = table[:num_bonds, 2].tolist()
+        list_length = table[:num_bonds, 3].astype(float).tolist()
+        if version == '2.2.1':
+            icohp_column = 4
+            list_translation = [[0, 0, 0] for _ in range(num_bonds)]
+            list_num = table[:num_bonds, 5].astype(int).tolist()
+        elif version == '3.1.1':
+            icohp_column = 7
+            list_translation = table[:num_bonds, 4:7].astype(int).tolist()
+            list_num = [1] * num_bonds
+        icohps = table[:, icohp_column].astype(float).tolist()
+        if self.is_spin_polarized:
+            list_icohp = [{Spin.up: up, Spin.down: down} for up, down in zip(icohps[:num_bonds], icohps[num_bonds:])]
+        else:
+            list_icohp = [{Spin.up: up} for up in icohps]
 
         # to avoid circular dependencies
         from pymatgen.electronic_structure.cohp import IcohpCollection
@@ -390,6 +420,19 @@ class Doscar:
 
     """
 
+    __slots__ = [
+        "_doscar",
+        "_final_structure",
+        "_is_spin_polarized",
+        "_efermi",
+        "_pdos",
+        "_tdos",
+        "_energies",
+        "_tdensities",
+        "_itdensities",
+        "_completedos",
+    ]
+
     def __init__(self, doscar: str = "DOSCAR.lobster", structure_file: str = "POSCAR", dftprogram: str = "Vasp"):
         """
         Args:
@@ -408,24 +451,24 @@ class Doscar:
 
         tdensities = {}
         itdensities = {}
-        f = open(doscar)
-        natoms = int(f.readline().split()[0])
-        efermi = float([f.readline() for nn in range(4)][3].split()[17])
-        dos = []
-        orbitals = []
-        for atom in range(natoms + 1):
-            line = f.readline()
-            ndos = int(line.split()[2])
-            orbitals.append(line.split(';')[-1].split())
-            line = f.readline().split()
-            cdos = np.zeros((ndos, len(line)))
-            cdos[0] = np.array(line)
-            for nd in range(1, ndos):
-                line = f.readline().split()
-                cdos[nd] = np.array(line)
-            dos.append(cdos)
-        f.close()
-        doshere = np.array(dos[0])
+        with zopen(doscar, "rt") as f:
+            natoms = int(f.readline().split()[0])
+            efermi = float([f.readline() for nn in range(4)][3].split()[17])
+            dos = []
+            orbitals = []
+            for atom in range(natoms + 1):
+                line = f.readline()
+                # Blank lines are tolerated between the blocks. Inside a block they take
+                # the place of a row, so the block cannot be parsed and raises ValueError.
+                while line and not line.strip():
+                    line = f.readline()
+                ndos = int(line.split()[2])
+                orbitals.append(line.split(';')[-1].split())
+                # Parse the ndos rows of this block in one go. Store it in Fortran order
+                # so that the energy and density columns are contiguous.
+                cdos = np.asfortranarray(_parse_float_rows("".join([f.readline() for nd in range(ndos)]), ndos))
+                dos.append(cdos)
+        doshere = dos[0]
         if len(doshere[0, :]) == 5:
             self._is_spin_polarized = True
         elif len(doshere[0, :]) == 3:
@@ -438,15 +481,11 @@ class Doscar:
             itdensities[Spin.up] = doshere[:, 2]
             pdoss = []
             spin = Spin.up
-            for atom in range(natoms):
-                pdos = defaultdict(dict)
-                data = dos[atom + 1]
-                _, ncol = data.shape
-                orbnumber = 0
-                for j in range(1, ncol):
-                    orb = orbitals[atom + 1][orbnumber]
-                    pdos[orb][spin] = data[:, j]
-                    orbnumber = orbnumber + 1
+            for atom, data in enumerate(dos[1:]):
+                pdos = {orb: {} for orb in orbitals[atom + 1]}  # type: Dict[str, Dict[Spin, np.ndarray]]
+                cols = data[:, 1:]
+                for k, orb in enumerate(orbitals[atom + 1]):
+                    pdos[orb][spin] = cols[:, k]
                 pdoss.append(pdos)
         else:
             tdensities[Spin.up] = doshere[:, 1]
@@ -454,20 +493,14 @@ class Doscar:
             itdensities[Spin.up] = doshere[:, 3]
             itdensities[Spin.down] = doshere[:, 4]
             pdoss = []
-            for atom in range(natoms):
-                pdos = defaultdict(dict)
-                data = dos[atom + 1]
-                _, ncol = data.shape
-                orbnumber = 0
-                for j in range(1, ncol):
-                    if j % 2 == 0:
-                        spin = Spin.down
-                    else:
-                        spin = Spin.up
-                    orb = orbitals[atom + 1][orbnumber]
-                    pdos[orb][spin] = data[:, j]
-                    if j % 2 == 0:
-                        orbnumber = orbnumber + 1
+            for atom, data in enumerate(dos[1:]):
+                pdos = {orb: {} for orb in orbitals[atom + 1]}  # type: Dict[str, Dict[Spin, np.ndarray]]
+                # up and down densities alternate column by column
+                ups = data[:, 1::2]
+                dns = data[:, 2::2]
+                for k, orb in enumerate(orbitals[atom + 1]):
+                    pdos[orb][Spin.up] = ups[:, k]
+                    pdos[orb][Spin.down] = dns[:, k]
                 pdoss.append(pdos)
 
         self._efermi = efermi
@@ -549,6 +582,14 @@ class Charge:
 
     """
 
+    __slots__ = [
+        "num_atoms",
+        "atomlist",
+        "types",
+        "Mulliken",
+        "Loewdin",
+    ]
+
     def __init__(self, filename: str = "CHARGE.lobster"):
         """
         Args:
@@ -560,16 +601,15 @@ class Charge:
             raise IOError("CHARGES file contains no data.")
 
         self.num_atoms = len(data)
-        self.atomlist = []  # type: List[str]
-        self.types = []  # type: List[str]
-        self.Mulliken = []  # type: List[float]
-        self.Loewdin = []  # type: List[float]
-        for atom in range(0, self.num_atoms):
-            line = data[atom].split()
-            self.atomlist.append(line[1] + line[0])
-            self.types.append(line[1])
-            self.Mulliken.append(float(line[2]))
-            self.Loewdin.append(float(line[3]))
+        rows = _charge_patt.findall("\n".join(data))
+        if len(rows) != self.num_atoms:
+            raise ValueError("CHARGES file contains rows that could not be parsed.")
+        # Convert the columns in bulk: number, type, Mulliken and Loewdin charge
+        table = np.array(rows)
+        self.atomlist = np.char.add(table[:, 1], table[:, 0]).tolist()  # type: List[str]
+        self.types = table[:, 1].tolist()  # type: List[str]
+        self.Mulliken = table[:, 2].astype(float).tolist()  # type: List[float]
+        self.Loewdin = table[:, 3].astype(float).tolist()  # type: List[float]
 
     def get_structure_with_charges(self, structure_filename):
         """
@@ -238,6 +238,30 @@ class CohpcarTest(PymatgenTest):
                              for orbs in self.cohp_Na2UO4.orb_res_cohp["49"]], axis=0)
         self.assertArrayAlmostEqual(tot_Na2UO4, icohp_Na2UO4, decimal=3)
 
+    def test_trailing_newline(self):
+        with open(os.path.join(test_dir, "COHPCAR.lobster.KF"), "rt") as f:
+            contents = f.read().rstrip("\n")
+        outfile_path = tempfile.mkstemp()[1]
+        with open(outfile_path, "w") as f:
+            f.write(contents + "\n")
+        cohp_KF = Cohpcar(filename=outfile_path)
+        os.remove(outfile_path)
+        self.assertArrayAlmostEqual(cohp_KF.energies, self.cohp_KF.energies)
+        self.assertArrayAlmostEqual(cohp_KF.cohp_data["1"]["COHP"][Spin.up],
+                                    self.cohp_KF.cohp_data["1"]["COHP"][Spin.up])
+
+    def test_unparsable_data(self):
+        # Fortran prints fields that overflow their format as asterisks
+        with open(os.path.join(test_dir, "COHPCAR.lobster.KF"), "rt") as f:
+            lines = f.read().split("\n")
+        lines[-5] = " ".join(["****"] * len(lines[-5].split()))
+        outfile_path = tempfile.mkstemp()[1]
+        with open(outfile_path, "w") as f:
+            f.write("\n".join(lines))
+        with self.assertRaises(ValueError):
+            Cohpcar(filename=outfile_path)
+        os.remove(outfile_path)
+
 
 class IcohplistTest(unittest.TestCase):
     def setUp(self):
@@ -339,6 +363,35 @@ class DoscarTest(unittest.TestCase):
 
         self.structure = Structure.from_dict(data)
 
+    def test_blank_lines(self):
+        doscar = os.path.join(test_dir_doscar, "DOSCAR.lobster.spin")
+        poscar = os.path.join(test_dir_doscar, "POSCAR.lobster.spin_DOS")
+        with open(doscar, "rt") as f:
+            lines = f.read().split("\n")
+        # the block headers are the lines that end with the orbital labels
+        headers = [i for i, line in enumerate(lines) if ";" in line]
+        outfile_path = tempfile.mkstemp()[1]
+
+        # blank lines between the blocks are skipped
+        blank_between = list(lines)
+        for i in reversed(headers):
+            blank_between.insert(i, "")
+        with open(outfile_path, "w") as f:
+            f.write("\n".join(blank_between))
+        doscar_blank = Doscar(doscar=outfile_path, structure_file=poscar)
+        self.assertListEqual(doscar_blank.energies.tolist(), self.DOSCAR_spin_pol.energies.tolist())
+        self.assertListEqual(doscar_blank.pdos[0]['2s'][Spin.down].tolist(),
+                             self.DOSCAR_spin_pol.pdos[0]['2s'][Spin.down].tolist())
+
+        # a blank line inside a block is an error
+        blank_inside = list(lines)
+        blank_inside.insert(headers[1] + 2, "")
+        with open(outfile_path, "w") as f:
+            f.write("\n".join(blank_inside))
+        with self.assertRaises(ValueError):
+            Doscar(doscar=outfile_path, structure_file=poscar)
+        os.remove(outfile_path)
+
     def test_completedos(self):
         # first for spin polarized version
         energies_spin = [-11.25000, -7.50000, -3.75000, 0.00000, 3.75000, 7.50000]
@@ -515,6 +568,18 @@ class ChargeTest(PymatgenTest):
         self.assertArrayEqual(types, self.charge2.types)
         self.assertArrayEqual(num_atoms, self.charge2.num_atoms)
 
+    def test_short_row(self):
+        with open(os.path.join(test_dir, "CHARGE.lobster.MnO"), "rt") as f:
+            lines = f.read().split("\n")
+        # drop the Loewdin charge of the first atom
+        lines[3] = lines[3].rsplit(None, 1)[0]
+        outfile_path = tempfile.mkstemp()[1]
+        with open(outfile_path, "w") as f:
+            f.write("\n".join(lines))
+        with self.assertRaises(ValueError):
+            Charge(filename=outfile_path)
+        os.remove(outfile_path)
+
     def test_get_structure_with_charges(self):
         structure_dict2 = {'lattice': {'c': 3.198244, 'volume': 23.132361565928807, 'b': 3.1982447183003364,
                                        'gamma': 60.00000011873414, 'beta': 60.00000401737447,